@@ -1,18 +1,23 @@
-import heapq
-import math
-import random
+import functools
+import tempfile
+from pathlib import Path
 
+import numpy as np
 import requests
 
 from visuallm.component_base import ComponentBase
 from visuallm.elements.barchart_element import BarChartElement, PieceInfo
 from visuallm.elements.plain_text_element import PlainTextElement
 
+WORD_SITE = "https://www.mit.edu/~ecprice/wordlist.10000"
+WORD_VOCABULARY_CACHE = Path.home() / ".cache" / "visuallm" / "wordlist.10000"
+
 
 class BarChartComponentSimple(ComponentBase):
     def __init__(self, long_contexts: bool = False, title="BarChart Component"):
         super().__init__(name="barchart_component", title=title)
         self.word_vocab, self.word_ids = download_word_vocabulary()
+        self._rng = np.random.default_rng()
         self.barchart_element = BarChartElement(
             processing_callback=self.barchart_callback, long_contexts=long_contexts
         )
@@ -21,22 +26,20 @@ class BarChartComponentSimple(ComponentBase):
         self.update_barchart_component()
 
     def update_barchart_component(self):
-        probs = sample_ten_words(self.word_ids)
-        top_k = 10
-        ten_largest_probs = heapq.nlargest(
-            top_k, zip(*zip(*probs), self.word_vocab)  # noqa: B905
-        )
-
-        piece_infos = []
-        for i in range(top_k):
-            piece_infos.append(
-                PieceInfo(
-                    pieceTitle=ten_largest_probs[i][1],
-                    barHeights=[ten_largest_probs[i][0]],
-                    barAnnotations=[f"{ten_largest_probs[i][0]:.2f}%"],
-                    barNames=[""],
-                )
+        ids, probs = sample_ten_words(self.word_ids, self._rng)
+        words = self.word_vocab[ids]
+        format_annotation = "{:.2f}%".format
+
+        # tolist converts all the numpy floats to python floats at once
+        piece_infos = [
+            PieceInfo(
+                pieceTitle=word,
+                barHeights=[prob],
+                barAnnotations=[format_annotation(prob)],
+                barNames=[""],
             )
+            for word, prob in zip(words, probs.tolist(), strict=True)
+        ]
 
         self.barchart_element.set_piece_infos(piece_infos)
 
@@ -46,41 +49,61 @@ class BarChartComponentSimple(ComponentBase):
         self.update_barchart_component()
 
 
+@functools.lru_cache(maxsize=1)
 def download_word_vocabulary():
-    """Download MIT word list as a word vocab.
+    """Download MIT word list as a word vocab. The list is downloaded only once
+    and then it is loaded from `WORD_VOCABULARY_CACHE`.
 
     Returns
     -------
-        Tuple[List[str], List[int]]: list of words and list of indices of the
+        Tuple[np.ndarray, np.ndarray]: array of words (`dtype=object`, so that
+            it can be indexed by arrays of ids) and array of indices of the
             corresponding words
     """
-    word_site = "https://www.mit.edu/~ecprice/wordlist.10000"
-    response = requests.get(word_site, timeout=10)
-    word_vocab = [x.decode("utf-8") for x in response.content.splitlines()]
-    word_ids = [i for i, _ in enumerate(word_vocab)]
+    word_vocab = np.asarray(_load_or_fetch(WORD_VOCABULARY_CACHE), dtype=object)
+    word_ids = np.arange(len(word_vocab))
     return word_vocab, word_ids
 
 
-def sample_ten_words(word_ids):
+def _load_or_fetch(path: Path) -> list[str]:
+    """Load the word list from `path`, if it isn't there, download it and
+    store it to `path`.
+    """
+    if path.exists():
+        return path.read_text(encoding="utf-8").splitlines()
+
+    response = requests.get(WORD_SITE, timeout=10)
+    response.raise_for_status()
+    content = response.content.decode("utf-8")
+
+    # write to a temporary file first, so that a concurrently started app never
+    # reads a partially written word list
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, delete=False
+    ) as f:
+        f.write(content)
+    Path(f.name).replace(path)
+    return content.splitlines()
+
+
+def sample_ten_words(word_ids, rng: np.random.Generator):
     """Sample 10 random ids from word_ids and give them 10 random exponentialy
     distributed probabilities.
+
+    Args:
+    ----
+        word_ids (np.ndarray): indices of the words to sample from
+        rng (np.random.Generator): generator of the random numbers
+
+    Returns:
+    -------
+        Tuple[np.ndarray, np.ndarray]: indices of the sampled words and their
+            probabilities (in percents) sorted from the largest to the smallest
     """
     k = 10
-    ten_samples = random.choices(word_ids, k=k)  # noqa: S311
-    ten_numbers = [math.exp(i + random_noise()) for i in range(k)]
-    ten_numbers_sum = sum(ten_numbers)
-    ten_probs = [n / ten_numbers_sum for n in ten_numbers]
-
-    probs = [[0.0] for _ in word_ids]
-    for i, p in zip(ten_samples, ten_probs, strict=True):
-        probs[i][0] = p * 100
-    return probs
-
-
-def random_noise(lower_bound=-1, upper_bound=1):
-    """Create random noise between lower_bound and upper bound."""
-    if lower_bound >= upper_bound:
-        raise ValueError()
-    range_size = upper_bound - lower_bound
-    noise = random.random() * range_size + lower_bound  # noqa: S311
-    return noise
+    ten_samples = rng.choice(len(word_ids), size=k, replace=False)
+    noise = rng.uniform(-1, 1, size=k)
+    ten_numbers = np.exp(np.arange(k) + noise)
+    ten_probs = np.sort(ten_numbers / ten_numbers.sum() * 100)[::-1]
+    return ten_samples, ten_probs
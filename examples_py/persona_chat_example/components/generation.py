@@ -1,4 +1,10 @@
+import weakref
+from collections.abc import Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
 from visuallm.components import GenerationComponent
+from visuallm.components.generators.base import GeneratedOutput
 from visuallm.elements.element_base import ElementBase
 
 from .input_display import PersonaChatVisualization
@@ -6,6 +12,14 @@ from .input_display import PersonaChatVisualization
 
 class Generation(GenerationComponent, PersonaChatVisualization):
     def __post_init__(self, *args, **kwargs):
+        # the generation for the next dataset sample is prepared in the background,
+        # so that when the user moves to it, it is displayed without waiting for
+        # the model
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        weakref.finalize(
+            self, self._prefetch_pool.shutdown, wait=False, cancel_futures=True
+        )
+        self._prefetch: tuple[Hashable, Future[GeneratedOutput]] | None = None
         self.after_on_generator_change_callback()
 
     def init_model_input_display(self) -> list[ElementBase]:
@@ -19,3 +33,67 @@ class Generation(GenerationComponent, PersonaChatVisualization):
         PersonaChatVisualization.update_dialogue_structure_display(
             self, add_target=False
         )
+
+    def generate_output(self, text_to_tokenizer: str) -> GeneratedOutput:
+        """Use the prefetched output if it was generated for the same text and
+        with the same generation parameters, otherwise generate it.
+        """
+        generation_parameters = self.selected_generation_parameters
+        key = _prefetch_key(text_to_tokenizer, generation_parameters)
+        # the prefetch is kept if it doesn't match, e.g. when the current sample
+        # is regenerated after the metrics selection changed
+        if self._prefetch is not None and self._prefetch[0] == key:
+            _, future = self._prefetch
+            self._prefetch = None
+            return future.result()
+        return self.generator.generate_output(
+            text_to_tokenizer, **generation_parameters
+        )
+
+    def after_on_dataset_change_callback(self):
+        super().after_on_dataset_change_callback()
+        self.prefetch_next_sample()
+
+    def after_on_generator_change_callback(self):
+        # the prefetched output was generated by the previous generator, the job
+        # is cancelled only if it hasn't started yet, a running job keeps the
+        # worker busy until it finishes and the next prefetch waits for it
+        if self._prefetch is not None:
+            self._prefetch[1].cancel()
+            self._prefetch = None
+        super().after_on_generator_change_callback()
+
+    def prefetch_next_sample(self):
+        """Start generating the output for the sample following the currently
+        loaded one, the most likely next sample the user selects.
+
+        Only the generators which support prefetching are used, e.g. calls of
+        `OpenAIGenerator` are paid even if the user never moves to the next sample.
+        """
+        if (
+            not self.generator.supports_prefetching
+            or self.generator.create_text_to_tokenizer is None
+        ):
+            return
+        split = self.get_split()
+        next_index = int(self.sample_selector_element.value_on_backend) + 1
+        if next_index >= len(split):
+            return
+
+        text_to_tokenizer = self.generator.create_text_to_tokenizer(split[next_index])
+        generation_parameters = self.selected_generation_parameters
+        key = _prefetch_key(text_to_tokenizer, generation_parameters)
+        if self._prefetch is not None:
+            if self._prefetch[0] == key:
+                return
+            # only a job which hasn't started yet is cancelled, the new one waits
+            # until the running job finishes
+            self._prefetch[1].cancel()
+        future = self._prefetch_pool.submit(
+            self.generator.generate_output, text_to_tokenizer, **generation_parameters
+        )
+        self._prefetch = (key, future)
+
+
+def _prefetch_key(text_to_tokenizer: str, generation_parameters: dict[str, Any]):
+    return text_to_tokenizer, tuple(sorted(generation_parameters.items()))
@@ -23,11 +23,40 @@ class Perplexity:
 
         return torch.sum(-probs * torch.log(probs))
 
+    def batch_calculation(self, probs: torch.Tensor, mask: torch.Tensor):
+        """Compute perplexity of all the padded sequences at once.
+
+        Args:
+        ----
+            probs (torch.Tensor): probabilities of the target tokens of shape (batch, length)
+            mask (torch.Tensor): mask of the not padded positions of shape (batch, length)
+        """
+        if not _has_torch:
+            raise RuntimeError("Cannot run perplexity, torch not defined!")
+        # padded positions get probability 1, which contributes 0 to the sum
+        probs = torch.where(mask, probs, torch.ones_like(probs))
+
+        return torch.sum(-probs * torch.log(probs), dim=-1)
+
 
 class F1Score:
     def __call__(self, preds: str, labels: str):
         return normalized_f1_measurement(preds, [labels]).F1Score
 
+    def batch_metric_calculation(self, preds: list[str], labels: list[str]):
+        """Compute F1 score of each of the predictions, each distinct label
+        is normalized only once.
+        """
+        normalized_labels = {
+            label: normalize_answer(label).split() for label in set(labels)
+        }
+        return [
+            calculate_f1_on_lists(
+                normalize_answer(pred).split(), normalized_labels[label]
+            )[2]
+            for pred, label in zip(preds, labels, strict=True)
+        ]
+
 
 @dataclass
 class F1Measurement:
@@ -151,6 +151,8 @@ def create_app(
     get_persona_traits: Callable[[], list[str]],
 ):
     # create components
+    perplexity = Perplexity()
+    f1_score = F1Score()
     visualize = Visualization(
         dataset=dataset,
         dataset_choices=dataset_choices,
@@ -166,9 +168,21 @@ def create_app(
             "max_new_tokens": MinMaxSelectorType(10, 100, default_value=30),
             "num_return_sequences": MinMaxSelectorType(1, 20),
         },
-        metrics_on_probs={"Perplexity": ProbsMetric("{:.5f}", False, Perplexity())},
+        metrics_on_probs={
+            "Perplexity": ProbsMetric(
+                "{:.5f}",
+                False,
+                perplexity,
+                batch_calculation=perplexity.batch_calculation,
+            )
+        },
         metrics_on_generated_text={
-            "F1-Score": GeneratedTextMetric("{:.2%}", True, F1Score())
+            "F1-Score": GeneratedTextMetric(
+                "{:.2%}",
+                True,
+                f1_score,
+                batch_metric_calculation=f1_score.batch_metric_calculation,
+            )
         },
     )
 
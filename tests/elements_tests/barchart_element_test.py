@@ -0,0 +1,85 @@
+from dataclasses import asdict
+
+from flask import Flask
+
+from visuallm.elements.barchart_element import BarChartElement, PieceInfo
+from visuallm.json_provider import create_json_provider
+
+
+def create_piece_info(title: str, height: float = 50):
+    return PieceInfo(
+        pieceTitle=title,
+        barHeights=[height],
+        barAnnotations=[f"{height:.2f}"],
+        barNames=["metric"],
+    )
+
+
+def create_element_with_pieces():
+    element = BarChartElement()
+    element.set_piece_infos([create_piece_info("a"), create_piece_info("b")])
+    # simulate sending the element to the frontend
+    element.construct_element_description()
+    return element
+
+
+def test_set_unchanged_piece_infos():
+    element = create_element_with_pieces()
+
+    element.set_piece_infos([create_piece_info("a"), create_piece_info("b")])
+
+    assert element.changed is False
+
+
+def test_set_changed_piece_infos():
+    element = create_element_with_pieces()
+
+    element.set_piece_infos([create_piece_info("a"), create_piece_info("b", 70)])
+
+    assert element.changed is True
+    assert element.piece_infos[1].barHeights == [70]
+
+
+def test_set_piece_infos_edited_in_place():
+    element = create_element_with_pieces()
+
+    piece_infos = element.piece_infos
+    piece_infos.append(create_piece_info("c"))
+    element.set_piece_infos(piece_infos)
+
+    assert element.changed is True
+    assert [p.pieceTitle for p in element.piece_infos] == ["a", "b", "c"]
+
+
+def test_set_piece_infos_list_edited_after_setting():
+    element = BarChartElement()
+    piece_infos = [create_piece_info("a")]
+    element.set_piece_infos(piece_infos)
+    element.construct_element_description()
+
+    piece_infos.append(create_piece_info("b"))
+    element.set_piece_infos(piece_infos)
+
+    assert element.changed is True
+    assert len(element.piece_infos) == 2
+
+
+def test_piece_info_to_dict():
+    piece_info = create_piece_info("a", 30)
+
+    assert piece_info.to_dict() == asdict(piece_info)
+    assert piece_info.to_dict()["barHeights"] is piece_info.barHeights
+
+
+def test_piece_infos_serialized_in_element_description():
+    element = create_element_with_pieces()
+    json_provider = create_json_provider(Flask(__name__))
+
+    description = json_provider.loads(
+        json_provider.dumps(element.construct_element_description())
+    )
+
+    assert description["piece_infos"] == [
+        create_piece_info("a").to_dict(),
+        create_piece_info("b").to_dict(),
+    ]
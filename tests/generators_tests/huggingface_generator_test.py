@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("transformers")
+
+from visuallm.components.generators.huggingface import (  # noqa: E402
+    HuggingFaceGenerator,
+    _is_tokenization_split_stable,
+)
+
+VOCAB_SIZE = 300
+
+
+class TokenizerStub:
+    def get_vocab(self):
+        return {f"token{i}": i for i in range(VOCAB_SIZE)}
+
+
+class CharacterTokenizerStub:
+
+    """Tokenizer which tokenizes each character to its code point, optionally
+    followed by the EOS token.
+    """
+
+    def __init__(self, append_eos: bool):
+        self.append_eos = append_eos
+
+    def __call__(self, text: str, add_special_tokens: bool = True):
+        input_ids = [ord(c) for c in text]
+        if self.append_eos and add_special_tokens:
+            input_ids.append(0)
+        return SimpleNamespace(input_ids=input_ids)
+
+
+def create_generator(n_largest_tokens_to_return: int = 10):
+    return HuggingFaceGenerator(
+        model=None,  # type: ignore[arg-type]
+        tokenizer=TokenizerStub(),  # type: ignore[arg-type]
+        retrieve_target_str=lambda sample: sample,
+        n_largest_tokens_to_return=n_largest_tokens_to_return,
+    )
+
+
+def softmax(logits: np.ndarray):
+    exp = np.exp(logits - logits.max())
+    return exp / exp.sum()
+
+
+def test_n_largest_tokens_are_sorted():
+    generator = create_generator()
+    probs = softmax(np.random.default_rng(0).normal(size=VOCAB_SIZE))
+
+    tokens_and_probs = generator.get_n_largest_tokens_and_probs(probs)
+
+    expected_ids = np.argsort(-probs)[:10]
+    assert [token for _, token in tokens_and_probs] == [
+        f"token{i}" for i in expected_ids
+    ]
+    np.testing.assert_allclose(
+        [prob for prob, _ in tokens_and_probs], probs[expected_ids] * 100
+    )
+
+
+def test_zero_largest_tokens():
+    generator = create_generator(n_largest_tokens_to_return=0)
+    probs = softmax(np.random.default_rng(0).normal(size=VOCAB_SIZE))
+
+    assert generator.get_n_largest_tokens_and_probs(probs) == []
+
+
+def test_subset_softmax_matches_renormalized_full_softmax():
+    generator = create_generator()
+    logits = np.random.default_rng(0).normal(size=VOCAB_SIZE).astype(np.float32)
+    probs = softmax(logits)
+
+    from_probs = generator.get_n_largest_tokens_and_probs(probs)
+    from_logits = generator.get_n_largest_tokens_and_probs(logits, from_logits=True)
+
+    assert [token for _, token in from_logits] == [token for _, token in from_probs]
+    top_k_probs = np.array([prob for prob, _ in from_probs])
+    np.testing.assert_allclose(
+        [prob for prob, _ in from_logits],
+        top_k_probs / top_k_probs.sum() * 100,
+        rtol=1e-5,
+    )
+
+
+def test_tokenization_split_stable():
+    tokenizer = CharacterTokenizerStub(append_eos=False)
+
+    assert _is_tokenization_split_stable(tokenizer) is True  # type: ignore[arg-type]
+
+
+def test_tokenization_appending_eos_is_not_split_stable():
+    tokenizer = CharacterTokenizerStub(append_eos=True)
+
+    assert _is_tokenization_split_stable(tokenizer) is False  # type: ignore[arg-type]
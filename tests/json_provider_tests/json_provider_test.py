@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from flask import Flask
+
+from visuallm.elements.barchart_element import PieceInfo
+from visuallm.json_provider import (
+    JSONProvider,
+    OrjsonProvider,
+    _has_orjson,
+    create_json_provider,
+)
+
+requires_orjson = pytest.mark.skipif(not _has_orjson, reason="orjson isn't installed")
+
+
+def create_message():
+    return {
+        "piece_infos": [
+            PieceInfo(
+                pieceTitle="title",
+                barHeights=[np.float32(50.0)],
+                barAnnotations=["50.00%"],
+                barNames=["metric"],
+            )
+        ],
+        "probs": np.array([0.25, 0.75]),
+        "b_key": 1,
+        "a_key": 2,
+    }
+
+
+EXPECTED_MESSAGE = {
+    "piece_infos": [
+        {
+            "pieceTitle": "title",
+            "barHeights": [50.0],
+            "barAnnotations": ["50.00%"],
+            "barNames": ["metric"],
+        }
+    ],
+    "probs": [0.25, 0.75],
+    "b_key": 1,
+    "a_key": 2,
+}
+
+
+def test_json_provider_serializes_piece_infos_and_numpy():
+    provider = JSONProvider(Flask(__name__))
+
+    assert provider.loads(provider.dumps(create_message())) == EXPECTED_MESSAGE
+
+
+@requires_orjson
+def test_orjson_provider_serializes_piece_infos_and_numpy():
+    provider = OrjsonProvider(Flask(__name__))
+
+    assert provider.loads(provider.dumps(create_message())) == EXPECTED_MESSAGE
+
+
+@requires_orjson
+def test_providers_give_the_same_output():
+    app = Flask(__name__)
+    json_provider, orjson_provider = JSONProvider(app), OrjsonProvider(app)
+
+    # the default provider adds spaces after separators in `dumps`
+    assert json_provider.dumps(
+        create_message(), separators=(",", ":")
+    ) == orjson_provider.dumps(create_message())
+    assert (
+        json_provider.response(create_message()).data
+        == orjson_provider.response(create_message()).data
+    )
+
+
+@requires_orjson
+def test_orjson_provider_sort_keys():
+    provider = OrjsonProvider(Flask(__name__))
+
+    assert provider.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+    provider.sort_keys = False
+    assert provider.dumps({"b": 1, "a": 2}) == '{"b":1,"a":2}'
+
+
+@requires_orjson
+def test_orjson_provider_honours_default():
+    provider = OrjsonProvider(Flask(__name__))
+
+    assert provider.dumps({"a": {1, 2}}, default=sorted) == '{"a":[1,2]}'
+
+
+@requires_orjson
+def test_orjson_provider_raises_on_unsupported_arguments():
+    provider = OrjsonProvider(Flask(__name__))
+
+    with pytest.raises(TypeError, match="cls"):
+        provider.dumps({}, cls=None)
+    with pytest.raises(ValueError, match="non-ASCII"):
+        provider.dumps({}, ensure_ascii=True)
+
+
+@requires_orjson
+def test_orjson_provider_response_not_compact():
+    app = Flask(__name__)
+    json_provider, orjson_provider = JSONProvider(app), OrjsonProvider(app)
+    json_provider.compact = orjson_provider.compact = False
+
+    assert (
+        json_provider.response(create_message()).data
+        == orjson_provider.response(create_message()).data
+    )
+
+
+def test_create_json_provider():
+    provider = create_json_provider(Flask(__name__))
+
+    assert isinstance(provider, OrjsonProvider if _has_orjson else JSONProvider)
@@ -0,0 +1,101 @@
+import pytest
+
+from examples_py.persona_chat_example.components.metrics import F1Score, Perplexity
+from visuallm.components.mixins.metrics_mixin import (
+    GeneratedTextMetric,
+    MetricsMixin,
+    ProbsMetric,
+)
+
+
+class MetricsMixinStub(MetricsMixin):
+    def metrics_processing_callback(self):
+        pass
+
+
+def displayed_annotations(mixin: MetricsMixin):
+    return [
+        piece_info.barAnnotations
+        for piece_info in mixin._display_metrics_on_predicted_element.piece_infos
+    ]
+
+
+def test_batched_probs_metrics_equal_per_generation():
+    torch = pytest.importorskip("torch")
+    perplexity = Perplexity()
+    vocab_size = 50
+    # the third generation is empty
+    lengths = [5, 3, 0, 7]
+    generator = torch.Generator().manual_seed(0)
+    probs = [
+        torch.softmax(torch.randn(1, length, vocab_size, generator=generator), -1)
+        for length in lengths
+    ]
+    generated_ids = [
+        torch.randint(0, vocab_size, (length,), generator=generator)
+        for length in lengths
+    ]
+    texts = [f"generation {i}" for i in range(len(lengths))]
+    batch_shapes = []
+
+    def batch_calculation_spy(target_probs, mask):
+        batch_shapes.append(tuple(target_probs.shape))
+        return perplexity.batch_calculation(target_probs, mask)
+
+    annotations = []
+    for batch_calculation in [None, batch_calculation_spy]:
+        mixin = MetricsMixinStub(
+            metrics_on_probs={
+                "Perplexity": ProbsMetric(
+                    "{:.5f}",
+                    False,
+                    perplexity,
+                    batch_calculation=batch_calculation,
+                )
+            }
+        )
+        mixin.compute_n_display_metrics_on_predicted(
+            texts, "target", probs, generated_ids
+        )
+        annotations.append(displayed_annotations(mixin))
+
+    # only the probabilities of the target tokens are stacked
+    assert batch_shapes == [(len(lengths), max(lengths))]
+    assert annotations[0] == annotations[1]
+    assert annotations[0][2] == ["0.00000"]
+
+
+def test_batched_text_metrics_equal_per_generation():
+    f1_score = F1Score()
+    # the third generation is empty
+    texts = ["the cat sat", "a dog", "", "cat dog sat"]
+    n_generations = len(texts)
+    batch_sizes = []
+
+    def batch_metric_calculation_spy(preds, labels):
+        batch_sizes.append(len(preds))
+        return f1_score.batch_metric_calculation(preds, labels)
+
+    annotations = []
+    for batch_metric_calculation in [None, batch_metric_calculation_spy]:
+        mixin = MetricsMixinStub(
+            metrics_on_generated_text={
+                "F1-Score": GeneratedTextMetric(
+                    "{:.4%}",
+                    True,
+                    f1_score,
+                    batch_metric_calculation=batch_metric_calculation,
+                )
+            }
+        )
+        mixin.compute_n_display_metrics_on_predicted(
+            texts,
+            "The cat and the dog sat!",
+            [None] * n_generations,
+            [None] * n_generations,
+        )
+        annotations.append(displayed_annotations(mixin))
+
+    assert batch_sizes == [n_generations]
+    assert annotations[0] == annotations[1]
+    assert annotations[0][2] == ["0.0000%"]
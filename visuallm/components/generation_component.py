@@ -1,7 +1,11 @@
 import logging
 
 from visuallm.component_base import ComponentBase
-from visuallm.components.generators.base import Generator, OutputProbabilityInterface
+from visuallm.components.generators.base import (
+    GeneratedOutput,
+    Generator,
+    OutputProbabilityInterface,
+)
 from visuallm.components.mixins.data_preparation_mixin import (
     DATASET_TYPE,
     DATASETS_TYPE,
@@ -141,6 +145,15 @@ class GenerationComponent(
             self.generator.create_text_to_tokenizer(self.loaded_sample)
         )
 
+    def generate_output(self, text_to_tokenizer: str) -> GeneratedOutput:
+        """Generate the outputs with the selected generator and generation parameters.
+
+        You may override this method to e.g. reuse already generated outputs.
+        """
+        return self.generator.generate_output(
+            text_to_tokenizer, **self.selected_generation_parameters
+        )
+
     def update_generated_output_display(self):
         """Generate outputs with the model, measure probabilities, compute all the
         metrics and update metrics display elements.
@@ -148,9 +161,7 @@ class GenerationComponent(
         if self.generator.retrieve_target_str is None:
             raise RetrieveTargetStrIsNoneError()
         text_to_tokenizer = self.text_to_tokenizer_element.content
-        output = self.generator.generate_output(
-            text_to_tokenizer, **self.selected_generation_parameters
-        )
+        output = self.generate_output(text_to_tokenizer)
 
         # compute metrics on generated
         probs, output_sequences = None, None
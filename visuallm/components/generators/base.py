@@ -61,27 +61,36 @@ class Generator:
         """
         return False
 
+    @property
+    def supports_prefetching(self):
+        """Whether outputs may be generated in advance in a background thread,
+        before the user asks for them. Generators which e.g. pay for each call
+        of an API shouldn't support it.
+        """
+        return False
+
     def generate_output(self, text_to_tokenizer: str, **kwargs) -> GeneratedOutput:
         raise NotImplementedError()
 
 
-class NextTokenPredictionInterface(ABC):
+class NextTokenPredictionInterface:
 
     """A class implementing this interface provides the ability to go over the
     generation in a token by token manner.
+
+    This is a plain class rather than an `ABC`, because `NextTokenPredictionComponent`
+    checks `isinstance(generator, NextTokenPredictionInterface)` on each request.
     """
 
     create_text_to_tokenizer_one_step: Callable[[Any, list[str]], str] | None
 
-    @abstractmethod
     def one_step_prediction(self, text_to_tokenizer: str) -> list[tuple[float, str]]:
         """Return k tokens with highest probabilities along with their probabilities."""
-        ...
+        raise NotImplementedError()
 
-    @abstractmethod
     def convert_token_to_string(self, token: str) -> str:
         """Convert token to string that can be appended to already predicted text."""
-        ...
+        raise NotImplementedError()
 
     @property
     def supports_next_token_prediction(self):
@@ -1,7 +1,9 @@
+import threading
+from collections import OrderedDict
 from collections.abc import Callable
-from heapq import nlargest
 from typing import TYPE_CHECKING, Any, TypeAlias, cast
 
+import numpy as np
 from transformers.generation.utils import GenerateOutput
 
 from visuallm.components.generators.base import (
@@ -33,6 +35,10 @@ if TYPE_CHECKING:
 
     TOKENIZER_TYPE: TypeAlias = PreTrainedTokenizer | PreTrainedTokenizerFast
 
+_N_CACHED_PROMPTS = 4
+"""How many of the last prompts passed to `HuggingFaceGenerator.generate_output`
+are kept tokenized"""
+
 
 class HuggingFaceGenerator(
     OutputProbabilityInterface, NextTokenPredictionInterface, Generator
@@ -50,6 +56,8 @@ class HuggingFaceGenerator(
         create_text_to_tokenizer_chat: CreateTextToTokenizerChat | None = None,
         create_text_to_tokenizer_one_step: Callable[[Any, list[str]], str]
         | None = None,
+        subset_softmax: bool = False,
+        reuse_prompt_tokens: bool | None = None,
     ):
         if not _has_torch:
             raise RuntimeError(
@@ -62,13 +70,34 @@ class HuggingFaceGenerator(
         self.create_text_to_tokenizer_one_step = create_text_to_tokenizer_one_step
         self.retrieve_target_str = retrieve_target_str
         self._n_largest_tokens_to_return = n_largest_tokens_to_return
+        self._subset_softmax = subset_softmax
+        """Whether `one_step_prediction` computes the softmax only over the
+        `n_largest_tokens_to_return` largest logits instead of the whole vocabulary,
+        see `get_n_largest_tokens_and_probs`"""
+        self._reuse_prompt_tokens = reuse_prompt_tokens
+        """Whether `tokenize_continuation` appends the ids of the continuation to
+        the cached ids of the prompt, if None it is checked on the first call,
+        see `_is_tokenization_split_stable`"""
+        self._tokenized_prompts: OrderedDict[str, torch.Tensor] = OrderedDict()
+        """The last texts passed to `generate_output` and their token ids. More
+        than one is kept, because the outputs may also be generated in the
+        background (see `supports_prefetching`)"""
+        self._tokenized_prompts_lock = threading.Lock()
         self.init_word_vocab()
 
+    @property
+    def supports_prefetching(self):
+        return True
+
     def generate_output(
         self, text_to_tokenizer: str, **generation_arguments: Any
     ) -> GeneratedOutput:
         """Run model_inputs through self._model.generate"""
-        model_inputs = self._tokenizer(text_to_tokenizer, return_tensors="pt")
+        input_ids = self.tokenize_prompt(text_to_tokenizer)
+        model_inputs = {
+            "input_ids": input_ids,
+            "attention_mask": torch.ones_like(input_ids),
+        }
         if "pad_token_id" not in generation_arguments:
             generation_arguments["pad_token_id"] = self._tokenizer.eos_token_id
 
@@ -83,7 +112,7 @@ class HuggingFaceGenerator(
             **generation_arguments,
         )
         output = cast(GenerateOutput, output)
-        input_length: int = model_inputs.input_ids.size(1)
+        input_length: int = input_ids.size(1)
 
         decoded_outputs = self.decode_output(output, input_length)
 
@@ -91,6 +120,59 @@ class HuggingFaceGenerator(
             decoded_outputs=decoded_outputs, input_length=input_length
         )
 
+    def tokenize_prompt(self, text_to_tokenizer: str) -> "torch.Tensor":
+        """Tokenize the prompt and cache its token ids, so that the prompt
+        isn't tokenized again when the probabilities of its continuations are
+        measured.
+
+        Returns
+        -------
+            torch.Tensor: token ids of shape (1, prompt_length)
+        """
+        with self._tokenized_prompts_lock:
+            input_ids = self._tokenized_prompts.get(text_to_tokenizer)
+            if input_ids is not None:
+                self._tokenized_prompts.move_to_end(text_to_tokenizer)
+                return input_ids
+
+        input_ids = self._tokenizer(text_to_tokenizer, return_tensors="pt").input_ids
+        with self._tokenized_prompts_lock:
+            self._tokenized_prompts[text_to_tokenizer] = input_ids
+            if len(self._tokenized_prompts) > _N_CACHED_PROMPTS:
+                self._tokenized_prompts.popitem(last=False)
+        return input_ids
+
+    def tokenize_continuation(self, text: str, input_length: int) -> "torch.Tensor":
+        """Tokenize the text which is a cached prompt followed by a continuation
+        (generated text or target). Only the continuation is tokenized, and its ids
+        are appended to the cached ids of the prompt. If the text doesn't start with
+        any of the cached prompts, the whole text is tokenized.
+
+        This requires that the tokenizer tokenizes the prompt followed by the
+        continuation in the same way as the prompt and the continuation
+        separately, e.g. it doesn't append EOS. Unless `reuse_prompt_tokens` is
+        passed to the constructor, this is checked on a probe text and the whole
+        text is always tokenized if the check fails.
+
+        Returns
+        -------
+            torch.Tensor: token ids of shape (1, sequence_length)
+        """
+        if self._reuse_prompt_tokens is None:
+            self._reuse_prompt_tokens = _is_tokenization_split_stable(self._tokenizer)
+        if self._reuse_prompt_tokens:
+            with self._tokenized_prompts_lock:
+                tokenized_prompts = list(self._tokenized_prompts.items())
+            for prompt, prompt_ids in reversed(tokenized_prompts):
+                if prompt_ids.size(1) == input_length and text.startswith(prompt):
+                    continuation_ids = self._tokenizer(
+                        text[len(prompt) :],
+                        add_special_tokens=False,
+                        return_tensors="pt",
+                    ).input_ids
+                    return torch.cat([prompt_ids, continuation_ids], dim=1)
+        return self._tokenizer(text, return_tensors="pt").input_ids
+
     def decode_output(
         self,
         output: GenerateOutput,
@@ -127,11 +209,16 @@ class HuggingFaceGenerator(
         """
         model_inputs = self._tokenizer(text_to_tokenizer, return_tensors="pt")
         with torch.no_grad():
-            probs: torch.Tensor = self._model(**model_inputs).logits
-            probs = torch.softmax(probs, dim=-1)
-        np_probs: NDArray = probs[0, -1, :].numpy()
-
-        return self.get_n_largest_tokens_and_probs(np_probs)
+            logits: torch.Tensor = self._model(**model_inputs).logits
+            # only the distribution of the last position is needed
+            scores = logits[0, -1, :]
+            if not self._subset_softmax:
+                scores = torch.softmax(scores, dim=-1)
+        np_scores: NDArray = scores.numpy()
+
+        return self.get_n_largest_tokens_and_probs(
+            np_scores, from_logits=self._subset_softmax
+        )
 
     def convert_token_to_string(self, token: str):
         return self._tokenizer.convert_tokens_to_string([token])
@@ -141,7 +228,8 @@ class HuggingFaceGenerator(
         word_vocab = [""] * vocab_size
         for str_val, int_val in self._tokenizer.get_vocab().items():
             word_vocab[int_val] = str_val
-        self.word_vocab = word_vocab
+        # object array, so that the vocab can be indexed by the top-k ids at once
+        self.word_vocab = np.asarray(word_vocab, dtype=object)
 
     def measure_output_probability(self, texts: list[str], input_length: int):
         """At first model is used to generate tokens. Then we want to compute probabilities of
@@ -162,37 +250,72 @@ class HuggingFaceGenerator(
         output_sequences_list: list[torch.Tensor] = []
         for text in texts:
             with torch.inference_mode():
-                sequence = self._tokenizer(text, return_tensors="pt")
-                output = self._model(**sequence)
+                input_ids = self.tokenize_continuation(text, input_length)
+                output = self._model(
+                    input_ids=input_ids, attention_mask=torch.ones_like(input_ids)
+                )
                 logits = cast(torch.Tensor, output.logits)
                 probs = torch.softmax(logits, dim=-1)
                 probs = probs[:, input_length - 1 : -1, :]
-                predicted_token_ids = sequence.input_ids[0, input_length:]
+                predicted_token_ids = input_ids[0, input_length:]
             probabilities.append(probs)
             output_sequences_list.append(predicted_token_ids)
 
         return probabilities, output_sequences_list
 
     def get_n_largest_tokens_and_probs(
-        self, probs: "NDArray"
+        self, scores: "NDArray", from_logits: bool = False
     ) -> list[tuple[float, str]]:
-        """Get the self._n_largest_tokens_to_return largest probabilities from the probs array,
+        """Get the self._n_largest_tokens_to_return largest probabilities from the scores array,
         and pair them with the corresponding str tokens.
 
         Args:
         ----
-            probs (NDArray): array with probabilities of tokens assigned by the language model. Shape (vocab_size,)
+            scores (NDArray): array with probabilities of tokens assigned by the language model,
+                or with the logits if `from_logits` is set. Shape (vocab_size,)
+            from_logits (bool, optional): whether `scores` holds the logits (pre-softmax scores)
+                instead of the probabilities. If set, the softmax is computed only over the
+                k largest logits, so the returned probabilities sum up to 100 and are exact
+                only if the softmax denominator is dominated by the k largest logits.
+                Defaults to False.
 
         Returns:
         -------
             List[Tuple[float, str]]: list of tuples of the token's probability and the corresponding
                 token
         """
-        if probs.shape[0] != len(self.word_vocab):
+        if scores.shape[0] != len(self.word_vocab):
             raise RuntimeError("Word vocab is populated with wrong data!")
 
-        return nlargest(
-            n=self._n_largest_tokens_to_return,
-            iterable=zip((float(x) * 100 for x in probs), self.word_vocab, strict=True),
-            key=lambda x: x[0],
-        )
+        k = min(self._n_largest_tokens_to_return, scores.shape[0])
+        if k <= 0:
+            return []
+        # partition in O(vocab_size) and sort only the k selected entries
+        top_k_ids = np.argpartition(scores, -k)[-k:]
+        top_k_ids = top_k_ids[np.argsort(-scores[top_k_ids])]
+        top_k_probs = scores[top_k_ids]
+
+        if from_logits:
+            # subset softmax, exp is computed only on the k selected logits
+            top_k_probs = np.exp(top_k_probs - top_k_probs[0])
+            top_k_probs = top_k_probs / top_k_probs.sum()
+
+        return [
+            (prob * 100, token)
+            for prob, token in zip(
+                top_k_probs.tolist(), self.word_vocab[top_k_ids], strict=True
+            )
+        ]
+
+
+def _is_tokenization_split_stable(tokenizer: "TOKENIZER_TYPE") -> bool:
+    """Check on a probe text whether the ids of a text are the ids of its prefix
+    followed by the ids of the rest of the text tokenized without the special tokens.
+    """
+    prompt, continuation = "Answer the question:", " It is a cat."
+    ids = tokenizer(prompt + continuation).input_ids
+    split_ids = (
+        tokenizer(prompt).input_ids
+        + tokenizer(continuation, add_special_tokens=False).input_ids
+    )
+    return ids == split_ids
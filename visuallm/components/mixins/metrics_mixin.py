@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeAlias, cast
 
 if TYPE_CHECKING:
     import torch
@@ -11,7 +11,7 @@ from visuallm.elements.plain_text_element import PlainTextElement
 from visuallm.elements.selector_elements import ButtonElement, CheckBoxSubElement
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricDescription:
     format: str
     """Format of the value that should be displayed on the page, e.g.
@@ -24,19 +24,41 @@ class MetricDescription:
     metric_calculation: Callable[[Any, Any], Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedTextMetric(MetricDescription):
     metric_calculation: Callable[[str, str], Any]
     """Function that given the text generated by the model and the target text
     will generate a value that can be displayed using `self.format`
     """
+    batch_metric_calculation: Callable[[list[str], list[str]], list[Any]] | None = None
+    """Optional function that given the list of texts generated by the model and
+    the list of the target texts computes the values for all the generations at once,
+    so that e.g. the scorer is set up only once. Used when there are multiple
+    generations.
+    """
 
 
-@dataclass
+@dataclass(slots=True)
 class ProbsMetric(MetricDescription):
     metric_calculation: Callable[[Any, Any], Any]
     """Function that given the probabilities vectors and target indices will
     generate a value that can be displayed using `self.format`"""
+    batch_calculation: Callable[
+        ["torch.Tensor", "torch.Tensor"], "torch.Tensor"
+    ] | None = None
+    """Optional function that computes the metric for all the generations at once.
+    Given the padded probabilities of the target tokens of shape
+    (n_generations, max_length) and the boolean mask of the valid (not padded)
+    positions of the same shape, it returns a tensor of shape (n_generations,).
+    Used only if there are multiple generations and all the selected metrics on
+    probabilities provide it."""
+
+
+ActiveMetric: TypeAlias = tuple[
+    str, Callable[[Any, Any], Any], Callable[..., str], bool, bool
+]
+"""name, metric_calculation, format function, scalable, whether the metric is
+computed on generated text"""
 
 
 class MetricsMixin(ABC):
@@ -92,7 +114,7 @@ class MetricsMixin(ABC):
             )
 
         self.metric_button_element = ButtonElement(
-            subelements=list(self._select_metrics_elements.values()),
+            subelements=list(self._select_metrics_by_order),
             button_text="Select Metrics to Display",
             processing_callback=self.metrics_processing_callback,
         )
@@ -118,6 +140,38 @@ class MetricsMixin(ABC):
 
         for key in ordering:
             self._select_metrics_elements[key] = CheckBoxSubElement(key, True)
+        # the checkboxes in the same order as `ordering`
+        self._select_metrics_by_order: list[CheckBoxSubElement] = [
+            self._select_metrics_elements[key] for key in ordering
+        ]
+
+    def _collect_active_metrics(self) -> list[ActiveMetric]:
+        """Collect the metrics, which are selected to be displayed, in the display
+        order, so that the selection is checked only once for all the generations.
+        """
+        active_metrics: list[ActiveMetric] = []
+        for name, select_element in zip(
+            self._ordering, self._select_metrics_by_order, strict=True
+        ):
+            if not select_element.value_on_backend:
+                continue
+            is_on_text = name in self._metrics_on_generated_text
+            metric_description: MetricDescription = (
+                self._metrics_on_generated_text[name]
+                if is_on_text
+                else self._metrics_on_probs[name]
+            )
+            active_metrics.append(
+                (
+                    name,
+                    metric_description.metric_calculation,
+                    # bound once, so that it isn't looked up for each displayed value
+                    metric_description.format.format,
+                    metric_description.scalable,
+                    is_on_text,
+                )
+            )
+        return active_metrics
 
     @property
     def metrics_selection_elements(self):
@@ -165,55 +219,150 @@ class MetricsMixin(ABC):
                 of generated sequences of indices of tokens)
             element (BarChartElement): Element where to display computed metrics.
         """
+        active_metrics = self._collect_active_metrics()
+        bar_names = [name for name, *_ in active_metrics]
+        batch_results = {
+            **self._compute_batched_text_metrics(
+                active_metrics, generated_text_list, label_text
+            ),
+            **self._compute_batched_probs_metrics(
+                active_metrics, probs_encoded_list, generated_encoded_list
+            ),
+        }
         piece_infos: list[PieceInfo] = []
-        for (
+        for i, (
             generated_text,
             probs_encoded,
             generated_ids_encoded,
-        ) in zip(
-            generated_text_list, probs_encoded_list, generated_encoded_list, strict=True
+        ) in enumerate(
+            zip(
+                generated_text_list,
+                probs_encoded_list,
+                generated_encoded_list,
+                strict=True,
+            )
         ):
-            bar_names: list[str] = []
             bar_annotations: list[str] = []
             bar_heights: list[float] = []
-            for name in self._ordering:
-                if not self._select_metrics_elements[name].value_on_backend:
-                    continue
-                bar_names.append(name)
-
-                if name in self._metrics_on_generated_text:
-                    metric_description: MetricDescription = (
-                        self._metrics_on_generated_text[name]
-                    )
-                    result = metric_description.metric_calculation(
-                        generated_text, label_text
-                    )
+            for (
+                name,
+                metric_calculation,
+                format_result,
+                scalable,
+                is_on_text,
+            ) in active_metrics:
+                if name in batch_results:
+                    result = batch_results[name][i]
+                elif is_on_text:
+                    result = metric_calculation(generated_text, label_text)
+                elif probs_encoded is None:
+                    result = 0
                 else:
-                    metric_description = self._metrics_on_probs[name]
-                    if probs_encoded is None:
-                        result = 0
-                    else:
-                        result = metric_description.metric_calculation(
-                            probs_encoded, generated_ids_encoded
-                        )
-
-                if metric_description.scalable:
+                    result = metric_calculation(probs_encoded, generated_ids_encoded)
+
+                if scalable:
                     bar_heights.append(min(result * 100, 100))
                 else:
                     bar_heights.append(100)
-                bar_annotations.append(metric_description.format.format(result))
+                bar_annotations.append(format_result(result))
 
             piece_infos.append(
                 PieceInfo(
                     pieceTitle=generated_text,
                     barHeights=bar_heights,
                     barAnnotations=bar_annotations,
-                    barNames=bar_names,
+                    barNames=list(bar_names),
                 )
             )
 
         element.set_piece_infos(piece_infos)
 
+    def _compute_batched_text_metrics(
+        self,
+        active_metrics: list[ActiveMetric],
+        generated_text_list: Sequence[str],
+        label_text: str,
+    ) -> dict[str, list[Any]]:
+        """Compute the selected metrics on generated text which provide
+        `batch_metric_calculation` for all the generations at once.
+
+        Returns
+        -------
+            dict[str, list[Any]]: for each batched metric name the list of results,
+                one for each generation
+        """
+        if len(generated_text_list) < 2:
+            return {}
+
+        batch_results: dict[str, list[Any]] = {}
+        for name, *_, is_on_text in active_metrics:
+            if not is_on_text:
+                continue
+            batch_calculation = self._metrics_on_generated_text[
+                name
+            ].batch_metric_calculation
+            if batch_calculation is not None:
+                batch_results[name] = batch_calculation(
+                    list(generated_text_list), [label_text] * len(generated_text_list)
+                )
+        return batch_results
+
+    def _compute_batched_probs_metrics(
+        self,
+        active_metrics: list[ActiveMetric],
+        probs_encoded_list: Sequence["torch.Tensor"] | Sequence[None],
+        generated_encoded_list: Sequence["torch.Tensor"] | Sequence[None],
+    ) -> dict[str, list[Any]]:
+        """Compute all the selected metrics on probabilities for all the generations
+        at once, if all of them provide `batch_calculation`.
+
+        Returns
+        -------
+            dict[str, list[Any]]: for each metric name the list of results, one
+                for each generation, empty if the metrics should be computed
+                one generation at a time
+        """
+        if len(probs_encoded_list) < 2:
+            return {}
+
+        names = [name for name, *_, is_on_text in active_metrics if not is_on_text]
+        batch_calculations = [
+            self._metrics_on_probs[name].batch_calculation for name in names
+        ]
+        if (
+            len(names) == 0
+            or any(c is None for c in batch_calculations)
+            or any(p is None for p in probs_encoded_list)
+            or any(g is None for g in generated_encoded_list)
+        ):
+            return {}
+
+        # torch is imported only here, as it is needed only when the generator
+        # provides probabilities
+        import torch
+        from torch.nn.utils.rnn import pad_sequence
+
+        generated_encoded = cast(Sequence[torch.Tensor], generated_encoded_list)
+        probs_encoded = cast(Sequence[torch.Tensor], probs_encoded_list)
+
+        # each tensor with probabilities is of shape (1, sentence_length, vocab_size),
+        # the probabilities of the target tokens are gathered before padding so that
+        # only tensors of shape (sentence_length,) are stacked
+        target_probs = pad_sequence(
+            [
+                p[0].gather(-1, g.unsqueeze(-1)).squeeze(-1)
+                for p, g in zip(probs_encoded, generated_encoded, strict=True)
+            ],
+            batch_first=True,
+        )
+        lengths = torch.tensor([g.size(0) for g in generated_encoded])
+        mask = torch.arange(target_probs.size(1))[None, :] < lengths[:, None]
+
+        return {
+            name: cast(Callable, batch_calculation)(target_probs, mask).tolist()
+            for name, batch_calculation in zip(names, batch_calculations, strict=True)
+        }
+
     def compute_n_display_metrics_on_predicted(
         self,
         generated_text_list: Sequence[str],
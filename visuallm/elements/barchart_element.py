@@ -7,7 +7,7 @@ from flask import request
 from .element_base import ElementWithEndpoint
 
 
-@dataclass
+@dataclass(slots=True)
 class PieceInfo:
 
     """BarChart element is composed of pieces. Each piece contains multiple bars, which
@@ -49,6 +49,17 @@ class PieceInfo:
                 f"be of the same length: {l1}, {l2}, {l3}"
             )
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a dict sent to the frontend, without the recursive
+        copying of `dataclasses.asdict`.
+        """
+        return {
+            "pieceTitle": self.pieceTitle,
+            "barHeights": self.barHeights,
+            "barAnnotations": self.barAnnotations,
+            "barNames": self.barNames,
+        }
+
 
 class BarChartElement(ElementWithEndpoint):
     def __init__(
@@ -106,17 +117,23 @@ class BarChartElement(ElementWithEndpoint):
 
     @property
     def piece_infos(self) -> list[PieceInfo]:
-        return self._piece_infos
+        # a copy, so that the list edited in place and passed to `set_piece_infos`
+        # is compared with the pieces that are actually displayed
+        return list(self._piece_infos)
 
     def set_piece_infos(self, piece_infos: list[PieceInfo]):
+        # the same pieces are already displayed on the frontend, there is no need
+        # to send them again
+        if piece_infos == self._piece_infos:
+            return
         # changed is a property that is checked to include every change
         # in the message from BE to FE, essential for the app to function
         self.set_changed()
-        self._piece_infos = piece_infos
+        self._piece_infos = list(piece_infos)
 
     def construct_element_configuration(self):
         return {
-            "piece_infos": self.piece_infos,
+            "piece_infos": self._piece_infos,
             "long_contexts": self.long_contexts,
             "selectable": self.selectable,
         }
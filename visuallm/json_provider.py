@@ -0,0 +1,120 @@
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    _has_orjson = False
+else:
+    _has_orjson = True
+
+
+def _default(o: Any) -> Any:
+    """Serialize objects which define `to_dict` with it, numpy arrays and scalars
+    with `tolist`, all the other objects are serialized in the same way as in the
+    default Flask JSON provider.
+    """
+    to_dict = getattr(o, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    if isinstance(o, np.ndarray | np.generic):
+        return o.tolist()
+    return DefaultJSONProvider.default(o)
+
+
+class JSONProvider(DefaultJSONProvider):
+
+    """Default Flask JSON provider which prefers `to_dict` of the serialized
+    objects over `dataclasses.asdict`.
+    """
+
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+
+    """JSON provider which serializes the responses from the backend to the
+    frontend with `orjson`. Dataclasses and numpy arrays are serialized natively,
+    without the `dataclasses.asdict` round-trip of the default provider.
+
+    `sort_keys` and `compact` are honoured as in the default provider, with
+    `sort_keys` the dataclasses are serialized through `to_dict` or
+    `dataclasses.asdict`. orjson always writes UTF-8, hence `ensure_ascii` is
+    False and cannot be set.
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+
+    def __init__(self, app: Flask):
+        if not _has_orjson:
+            raise RuntimeError("orjson isn't installed, OrjsonProvider needs it.")
+        super().__init__(app)
+
+    def _dumps_bytes(
+        self,
+        obj: Any,
+        default: Callable[[Any], Any] | None = None,
+        sort_keys: bool | None = None,
+        indent: int | None = None,
+        separators: tuple[str, str] | None = None,
+        ensure_ascii: bool | None = None,
+        append_newline: bool = False,
+        **kwargs: Any,
+    ) -> bytes:
+        if kwargs:
+            raise TypeError(
+                f"OrjsonProvider doesn't support the arguments: {', '.join(kwargs)}"
+            )
+        if self.ensure_ascii or ensure_ascii:
+            raise ValueError("OrjsonProvider cannot escape non-ASCII characters.")
+        if indent not in (None, 2):
+            raise ValueError("OrjsonProvider supports only indent of 2 spaces.")
+        if separators not in (None, (",", ":")):
+            raise ValueError("OrjsonProvider supports only the compact separators.")
+
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys if sort_keys is None else sort_keys:
+            # orjson doesn't sort the fields of dataclasses, they are converted
+            # to dicts by `default` instead
+            option |= orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent is not None:
+            option |= orjson.OPT_INDENT_2
+        if append_newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(
+            obj, default=self.default if default is None else default, option=option
+        )
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._dumps_bytes(obj, **kwargs).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            raise TypeError(
+                f"OrjsonProvider doesn't support the arguments: {', '.join(kwargs)}"
+            )
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = None
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            indent = 2
+        return self._app.response_class(
+            self._dumps_bytes(obj, indent=indent, append_newline=True),
+            mimetype=self.mimetype,
+        )
+
+
+def create_json_provider(app: Flask) -> DefaultJSONProvider:
+    """Create `OrjsonProvider` if `orjson` is installed, otherwise fall back to
+    the `JSONProvider` based on the default Flask JSON provider.
+    """
+    if _has_orjson:
+        return OrjsonProvider(app)
+    return JSONProvider(app)
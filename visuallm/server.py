@@ -9,6 +9,8 @@ from typing import TYPE_CHECKING
 from flask import Flask, redirect
 from flask_cors import CORS
 
+from .json_provider import create_json_provider
+
 if TYPE_CHECKING:
     from .component_base import ComponentBase
 
@@ -27,6 +29,7 @@ class Server:
             static_url_path="",
             static_folder=self._retrieve_static_files_path(),
         )
+        self.app.json = create_json_provider(self.app)
 
         self.components: list[ComponentBase] = components
         self.registered_urls: set[str] = {"/", "/fetch_component_infos"}